@@ -14,139 +14,354 @@ quicknote.py — Basit bir komut satırı not yöneticisi.
 from __future__ import annotations
 import argparse
 import json
+import os
 import re
 import sys
 import textwrap
-from dataclasses import dataclass, asdict
+import time
+from collections import Counter
+from dataclasses import dataclass, field, replace
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Any, Optional
-import uuid
+from typing import List, Dict, Any, Iterable, Optional, Pattern, TextIO, Tuple
 import random
+import secrets
 
-NOTES_FILE = Path.home() / ".quicknotes.json"
+# varsa RE2: doğrusal zamanlı, felaket geri izleme (ReDoS) yok. Farkları:
+# \w \d \s \b yalnızca ASCII eşler ("gez\w+" ~ "gezişi" olmaz), büyük/küçük
+# harf katlaması da re'den farklı olabilir (ör. "İ"/"i"). Bu sınıfları
+# kullanan desenler _compile'da standart re'ye bırakılır.
+try:
+    import re2 as _re
+except ImportError:
+    _re = re
+
+try:  # varsa orjson: json'dan birkaç kat hızlı, doğrudan bytes üretir
+    import orjson
+
+    def _dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+
+    def _dumps_line(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE)
+
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+
+    def _dumps_line(obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False).encode("utf-8") + b"\n"
+
+    _loads = json.loads
+
+# satır başına bir not (JSONL): ekleme dosyayı baştan yazmadan sona yapılır
+NOTES_FILE = Path.home() / ".quicknotes.jsonl"
+LEGACY_NOTES_FILE = Path.home() / ".quicknotes.json"
+
+# öncelik 0-3 için gösterim
+_PRIO = ("   ", "(!)", "(!!)", "(!!!)")
+
+# RE2'de yalnızca ASCII eşleyen karakter sınıfları
+_UNICODE_CLASSES = re.compile(r"\\[wWdDsSbB]")
+
+# bunlardan hiçbiri yoksa desen düz metindir, RE2'ye gerek yok
+_REGEX_META = frozenset(".^$*+?{}[]\\|()")
 
 
 # ---------- Model ----------
 
-@dataclass
+@dataclass(slots=True)
 class Note:
     id: str
     text: str
     created_at: str  # ISO
     done: bool = False
-    tags: List[str] = None
+    tags: List[str] = field(default_factory=list)
     priority: int = 0  # 0-3
-
-    def matches(self, pattern: str) -> bool:
-        if not pattern:
+    created_ts: int = 0  # epoch saniye; yoksa created_at'ten doldurulur
+
+    def __post_init__(self) -> None:
+        # eski dosyalarda "tags": null olabilir
+        if self.tags is None:
+            self.tags = []
+        if not self.created_ts:
+            try:
+                self.created_ts = int(datetime.fromisoformat(self.created_at).timestamp())
+            except Exception:
+                pass
+
+    def matches(self, rx: Optional[Pattern[str]]) -> bool:
+        if rx is None:
             return True
-        rx = re.compile(pattern, re.IGNORECASE)
-        return bool(rx.search(self.text) or any(rx.search(t) for t in (self.tags or [])))
+        return bool(rx.search(self.text) or any(rx.search(t) for t in self.tags))
 
     @property
     def age_days(self) -> int:
-        try:
-            dt = datetime.fromisoformat(self.created_at)
-        except Exception:
+        if not self.created_ts:
             return 0
-        return (datetime.now() - dt).days
+        return (int(time.time()) - self.created_ts) // 86400
 
 
 # ---------- Storage ----------
 
-def load_notes() -> List[Note]:
-    if not NOTES_FILE.exists():
-        return []
+@dataclass
+class _Cache:
+    # dosya değişmediyse tekrar okuyup ayrıştırmamak için
+    key: Tuple[int, int]  # (mtime_ns, boyut)
+    notes: List[Note]
+    ordered: Optional[List[Note]] = None  # öncelik/tarih sırası, gerektiğinde hesaplanır
+    index: Optional[Dict[str, int]] = None  # id -> notes içindeki konum, gerektiğinde hesaplanır
+
+
+_CACHE: Optional[_Cache] = None
+
+
+def _note_to_dict(n: Note) -> Dict[str, Any]:
+    # asdict() her alanı (tags listesi dahil) derin kopyalar; burada gerek yok
+    return {
+        "id": n.id,
+        "text": n.text,
+        "created_at": n.created_at,
+        "done": n.done,
+        "tags": n.tags,
+        "priority": n.priority,
+    }
+
+
+def _note_to_record(n: Note) -> Dict[str, Any]:
+    # diskteki satır: dışa aktarılan alanlar + yalnızca iç kullanımlı created_ts
+    d = _note_to_dict(n)
+    d["created_ts"] = n.created_ts
+    return d
+
+
+def write_notes_json(notes: Iterable[Note], out: TextIO) -> None:
+    # not not yaz: bellekte aynı anda yalnızca tek notun çıktısı olur; _dumps(list) ile aynı çıktı
+    first = True
+    for n in notes:
+        out.write("[\n  " if first else ",\n  ")
+        out.write(_dumps(_note_to_dict(n)).decode("utf-8").replace("\n", "\n  "))
+        first = False
+    out.write("[]" if first else "\n]")
+
+
+def _file_key() -> Tuple[int, int]:
+    st = NOTES_FILE.stat()
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _migrate_legacy() -> Optional[_Cache]:
+    # eski tek JSON dizisi biçimini bir kez JSONL'e çevir, eskisini .bak olarak sakla
     try:
-        data = json.loads(NOTES_FILE.read_text(encoding="utf-8"))
-        return [Note(**n) for n in data]
+        notes = [Note(**n) for n in _loads(LEGACY_NOTES_FILE.read_bytes())]
     except Exception as e:
+        print(f"[hata] Eski not dosyası okunamadı: {e}", file=sys.stderr)
+        return None
+    save_notes(notes)
+    LEGACY_NOTES_FILE.replace(LEGACY_NOTES_FILE.with_suffix(".json.bak"))
+    return _CACHE
+
+
+def _load_cache() -> Optional[_Cache]:
+    global _CACHE
+    try:
+        key = _file_key()
+    except FileNotFoundError:
+        _CACHE = None
+        return _migrate_legacy() if LEGACY_NOTES_FILE.exists() else None
+    if _CACHE is not None and _CACHE.key == key:
+        return _CACHE
+    try:
+        raw = NOTES_FILE.read_bytes()
+    except OSError as e:
         print(f"[hata] Not dosyası okunamadı: {e}", file=sys.stderr)
+        _CACHE = None
+        return None
+    notes = []
+    for no, line in enumerate(raw.splitlines(), 1):
+        if not line.strip():
+            continue
+        try:
+            notes.append(Note(**_loads(line)))
+        except Exception as e:
+            # ör. yazarken çökmeden kalan yarım satır; tüm dosyayı çöpe atma
+            print(f"[uyarı] {no}. satır okunamadı, atlandı: {e}", file=sys.stderr)
+    _CACHE = _Cache(key, notes)
+    return _CACHE
+
+
+def load_notes() -> List[Note]:
+    # liste kopyadır ama Note nesneleri önbellektekilerle aynıdır: değiştirme!
+    # değişiklik gerekiyorsa dataclasses.replace ile kopyala ve save_notes'a ver
+    cache = _load_cache()
+    return list(cache.notes) if cache else []
+
+
+def load_ordered_notes() -> List[Note]:
+    # search_notes her sorguda yeniden sıralamasın diye sıralı görünüm önbellekte tutulur;
+    # dönen liste de notlar da önbelleğin kendisidir, salt okunur kullan
+    cache = _load_cache()
+    if cache is None:
         return []
+    if cache.ordered is None:
+        cache.ordered = sorted(cache.notes, key=lambda n: (-n.priority, n.created_at))
+    return cache.ordered
 
 
-def save_notes(notes: List[Note]) -> None:
+def save_notes(notes: List[Note], index: Optional[Dict[str, int]] = None) -> None:
+    # index: id'ler ve konumlar değişmediyse çağıranın elindeki dizin yeni önbelleğe taşınır
+    global _CACHE
     tmp = NOTES_FILE.with_suffix(".tmp")
-    tmp.write_text(json.dumps([asdict(n) for n in notes], ensure_ascii=False, indent=2), encoding="utf-8")
-    tmp.replace(NOTES_FILE)
+    data = b"".join(_dumps_line(_note_to_record(n)) for n in notes)
+    # geçici dosyaya yaz -> diske zorla -> atomik olarak yerine koy
+    with open(tmp, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, NOTES_FILE)
+    _CACHE = _Cache(_file_key(), list(notes), index=index)
 
 
 # ---------- Operations ----------
 
-def add_note(text: str, tags: List[str], priority: int) -> Note:
-    note = Note(
+def _make_note(text: str, tags: List[str], priority: int) -> Note:
+    now = datetime.now().replace(microsecond=0)
+    return Note(
         id=_short_uuid(),
         text=text.strip(),
-        created_at=datetime.now().isoformat(timespec="seconds"),
+        created_at=now.isoformat(),
         tags=[t.strip() for t in tags if t.strip()],
         priority=int(priority),
+        created_ts=int(now.timestamp()),
     )
-    notes = load_notes()
-    notes.append(note)
-    save_notes(notes)
-    return note
+
+
+def add_note(text: str, tags: List[str], priority: int) -> Note:
+    return add_notes_bulk([(text, tags, priority)])[0]
+
+
+def add_notes_bulk(items: Iterable[Tuple[str, List[str], int]]) -> List[Note]:
+    # yalnızca yeni satırları dosyanın sonuna ekle; mevcut notlar yeniden yazılmaz
+    global _CACHE
+    new = [_make_note(text, tags, priority) for text, tags, priority in items]
+    if not NOTES_FILE.exists() and LEGACY_NOTES_FILE.exists():
+        _migrate_legacy()
+    # dosyayı okuyup ayrıştırmadan ekle; önbellek yalnızca dosyanın şu anki
+    # hâlini tutuyorsa genişletilir
+    try:
+        before: Optional[Tuple[int, int]] = _file_key()
+    except FileNotFoundError:
+        before = None
+    cache = _CACHE if _CACHE is not None and _CACHE.key == before else None
+    data = b"".join(_dumps_line(_note_to_record(n)) for n in new)
+    with open(NOTES_FILE, "a+b") as f:
+        f.seek(0, os.SEEK_END)
+        if f.tell():
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                # yarım kalmış son satıra yapışmasın; yeni notlar kendi satırında başlasın
+                data = b"\n" + data
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    if cache is not None:
+        _CACHE = _Cache(_file_key(), cache.notes + new)
+    elif before is None:  # dosya yeni oluştu: içeriği tam olarak yeni notlar
+        _CACHE = _Cache(_file_key(), list(new))
+    else:
+        _CACHE = None
+    return new
 
 
 def mark_done(note_id: str) -> bool:
-    notes = load_notes()
-    hit = False
-    for n in notes:
-        if n.id == note_id:
-            n.done = True
-            hit = True
-            break
-    if hit:
-        save_notes(notes)
-    return hit
+    cache = _load_cache()
+    if cache is None:
+        return False
+    if cache.index is None:
+        cache.index = {}
+        for i, n in enumerate(cache.notes):
+            cache.index.setdefault(n.id, i)
+    i = cache.index.get(note_id)
+    if i is None:
+        return False
+    # önbellekteki notu değil kopyasını değiştir; kayıt başarısız olursa önbellek diskle uyumlu kalsın
+    notes = list(cache.notes)
+    notes[i] = replace(notes[i], done=True)
+    # id'ler ve konumlar değişmedi; dizin yeni önbellekte de geçerli
+    save_notes(notes, index=cache.index)
+    return True
 
 
 def clear_done() -> int:
     notes = load_notes()
-    before = len(notes)
-    notes = [n for n in notes if not n.done]
-    save_notes(notes)
-    return before - len(notes)
+    kept = [n for n in notes if not n.done]
+    removed = len(notes) - len(kept)
+    if removed:
+        # silinecek bir şey yoksa dosyayı (ve fsync'i) boşuna yeniden yazma
+        save_notes(kept)
+    return removed
+
+
+def _compile(pattern: str) -> Optional[Pattern[str]]:
+    if not pattern:
+        return None
+    if _re is not re and not _UNICODE_CLASSES.search(pattern):
+        try:
+            return _re.compile("(?i)" + pattern)
+        except _re.error:
+            pass  # RE2 geri başvuru, lookaround vb. desteklemez
+    # \w, \d, \b... Türkçe harfleri de eşlesin diye standart re
+    return re.compile(pattern, re.IGNORECASE)
 
 
 def search_notes(pattern: str, include_done: bool) -> List[Note]:
-    notes = load_notes()
-    return sorted(
-        [n for n in notes if n.matches(pattern) and (include_done or not n.done)],
-        key=lambda n: (-n.priority, n.created_at),
-    )
+    # zaten sıralı: süzme sırayı korur, sorgu başına sıralama gerekmez.
+    # ucuz "done" kontrolü önce: tamamlanmış notlar eşleştirmeye hiç girmez
+    notes = load_ordered_notes()
+    if pattern and not _REGEX_META.intersection(pattern):
+        # düz metinde geri izleme riski yok; RE2'ye gerek yok, standart re
+        # büyük/küçük harfi eskisi gibi eşler (ör. "istanbul" ~ "İstanbul")
+        rx = re.compile(re.escape(pattern), re.IGNORECASE)
+    else:
+        # deseni her not için değil, arama başına bir kez derle
+        rx = _compile(pattern)
+    return [n for n in notes if (include_done or not n.done) and n.matches(rx)]
 
 
 def stats() -> Dict[str, Any]:
     notes = load_notes()
-    total = len(notes)
-    done = sum(1 for n in notes if n.done)
-    pending = total - done
-    highest = max((n.priority for n in notes), default=0)
-    by_tag: Dict[str, int] = {}
+    # tek geçişte say; etiketler için Counter'ın C hızlı yolunu kullan
+    done = highest = 0
+    by_tag: Counter[str] = Counter()
     for n in notes:
-        for t in (n.tags or []):
-            by_tag[t] = by_tag.get(t, 0) + 1
+        done += n.done
+        if n.priority > highest:
+            highest = n.priority
+        if n.tags:
+            by_tag.update(n.tags)
+    total = len(notes)
     return {
         "total": total,
-        "pending": pending,
+        "pending": total - done,
         "done": done,
         "highest_priority": highest,
         "tags": dict(sorted(by_tag.items(), key=lambda kv: (-kv[1], kv[0]))),
     }
 
 
-def export_notes(fmt: str) -> str:
+def export_notes(fmt: str, out: TextIO) -> None:
     notes = load_notes()
     if fmt == "md":
         lines = ["# QuickNotes", ""]
         for n in sorted(notes, key=lambda x: (x.done, -x.priority, x.created_at)):
             chk = "x" if n.done else " "
-            tagstr = " ".join(f"`{t}`" for t in (n.tags or []))
+            tagstr = " ".join(f"`{t}`" for t in n.tags)
             lines.append(f"- [{chk}] **{_prio(n.priority)}** {n.text}  \n  _{n.id}_ · {n.created_at} {tagstr}")
-        return "\n".join(lines)
+        out.write("\n".join(lines))
     elif fmt == "json":
-        return json.dumps([asdict(n) for n in notes], ensure_ascii=False, indent=2)
+        # metni bellekte toplamadan doğrudan akışa yaz
+        write_notes_json(notes, out)
     else:
         raise ValueError("format desteklenmiyor (md|json)")
 
@@ -162,28 +377,33 @@ def print_table(notes: List[Note]) -> None:
     prw = 3
     tw = max(30, min(80, max(len(n.text) for n in notes)))
     head = f"{'ID':<{idw}}  {'P':<{prw}}  {'Durum':<5}  {'Not':<{tw}}  Tags"
-    print(head)
-    print("-" * len(head))
+    # satır satır print yerine hepsini biriktirip tek seferde yaz
+    out = [head, "-" * len(head)]
     for n in notes:
         status = "done" if n.done else "todo"
-        wrapped = textwrap.wrap(n.text, width=tw) or [""]
+        # sığan kısa metinde textwrap'in regex'li ayrıştırıcısına gerek yok
+        # (sekme/satır sonu içerenler yine textwrap'ten geçsin ki çıktı aynı kalsın)
+        if len(n.text) <= tw and n.text.isprintable():
+            wrapped = [n.text]
+        else:
+            wrapped = textwrap.wrap(n.text, width=tw) or [""]
         first = True
         for line in wrapped:
             if first:
-                tagstr = ",".join(n.tags or [])
-                print(f"{n.id:<{idw}}  {n.priority:<{prw}}  {status:<5}  {line:<{tw}}  {tagstr}")
+                tagstr = ",".join(n.tags)
+                out.append(f"{n.id:<{idw}}  {n.priority:<{prw}}  {status:<5}  {line:<{tw}}  {tagstr}")
                 first = False
             else:
-                print(f"{'':<{idw}}  {'':<{prw}}  {'':<5}  {line:<{tw}}  ")
-    print()
+                out.append(f"{'':<{idw}}  {'':<{prw}}  {'':<5}  {line:<{tw}}  ")
+    sys.stdout.write("\n".join(out) + "\n\n")
 
 
 def _prio(p: int) -> str:
-    return {0: "   ", 1: "(!)", 2: "(!!)", 3: "(!!!)"}.get(p, "   ")
+    return _PRIO[p] if 0 <= p < len(_PRIO) else _PRIO[0]
 
 
 def _short_uuid() -> str:
-    return uuid.uuid4().hex[:8]
+    return secrets.token_hex(4)
 
 
 def seed_random_notes(n: int) -> List[Note]:
@@ -193,13 +413,13 @@ def seed_random_notes(n: int) -> List[Note]:
         "kod gözden geçirme", "günlük yedek al"
     ]
     tags = ["acil", "iş", "ev", "okul", "market", "deneme"]
-    added = []
-    for _ in range(n):
-        text = random.choice(samples)
-        tgs = random.sample(tags, k=random.randint(0, 2))
-        pr = random.randint(0, 3)
-        added.append(add_note(text, tgs, pr))
-    return added
+    # rastgeleliği not başına ayrı çağrılar yerine toplu üret
+    texts = random.choices(samples, k=n)
+    prios = random.choices(range(4), k=n)
+    ntags = random.choices(range(3), k=n)
+    return add_notes_bulk(
+        (text, random.sample(tags, k=k), pr) for text, k, pr in zip(texts, ntags, prios)
+    )
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -259,8 +479,8 @@ def main(argv: Optional[List[str]] = None) -> int:
             s = stats()
             print(json.dumps(s, ensure_ascii=False, indent=2))
         elif args.cmd == "export":
-            out = export_notes(args.format)
-            print(out)
+            export_notes(args.format, sys.stdout)
+            print()
         elif args.cmd == "seed":
             added = seed_random_notes(args.n)
             print(f"eklenen örnek not: {len(added)}")